@@ -1,6 +1,8 @@
 from pydantic import BaseModel
 from typing import List, Literal, Annotated
 from operator import add
+import argparse
+import time
 from langgraph.graph import StateGraph, END
 from langgraph.graph.state import CompiledStateGraph
 from langchain_groq import ChatGroq
@@ -15,6 +17,9 @@ load_dotenv()
 # JSON file path for storing jokes
 JOKES_FILE = "jokes_history.json"
 
+# Writer/Critic chatter; turned off in headless batch mode
+VERBOSE = True
+
 # Initialize LLM for joke generation
 llm = ChatGroq(
     model="llama-3.1-8b-instant",
@@ -37,6 +42,7 @@ class JokeState(BaseModel):
     quit: bool = False
     current_joke: str = ""  # Temporary storage for joke being reviewed
     critic_approved: bool = False
+    critic_error: bool = False  # Critic call failed, so the joke was approved unreviewed
     revision_count: int = 0  # Track how many times Writer revised
 
 def load_jokes_from_json() -> List[Joke]:
@@ -59,6 +65,11 @@ def save_jokes_to_json(jokes: List[Joke]):
     except Exception as e:
         print(f"Warning: Could not save jokes history: {str(e)}")
 
+def say(message: str):
+    """Print agent progress unless running headless"""
+    if VERBOSE:
+        print(message)
+
 def get_joke(language: str = "en", category: str = "neutral") -> str:
     """Generate a joke using LLM based on category and language"""
     
@@ -91,21 +102,22 @@ def get_joke(language: str = "en", category: str = "neutral") -> str:
 def writer_agent(state: JokeState) -> dict:
     """Writer agent that generates jokes"""
     if state.revision_count > 0:
-        print(f"\n✍️  Writer: Okay, let me try again (Attempt #{state.revision_count + 1})...")
+        say(f"\n✍️  Writer: Okay, let me try again (Attempt #{state.revision_count + 1})...")
     else:
-        print("\n✍️  Writer: Crafting a joke for you...")
+        say("\n✍️  Writer: Crafting a joke for you...")
     
     joke_text = get_joke(language=state.language, category=state.category)
     
     return {
         "current_joke": joke_text,
         "revision_count": state.revision_count + 1,
-        "critic_approved": False
+        "critic_approved": False,
+        "critic_error": False
     }
 
 def critic_agent(state: JokeState) -> dict:
     """Critic agent that evaluates jokes"""
-    print("\n🎭 Critic: Let me evaluate this joke...")
+    say("\n🎭 Critic: Let me evaluate this joke...")
     
     # Build critic prompt
     critic_prompt = f"""You are a professional comedy critic. Evaluate this joke:
@@ -128,15 +140,15 @@ Be strict but fair. Only approve genuinely funny jokes."""
         evaluation = response.content.strip()
         
         if "APPROVED" in evaluation.upper():
-            print("✅ Critic: This joke passes! It's ready to share.")
+            say("✅ Critic: This joke passes! It's ready to share.")
             return {"critic_approved": True}
         else:
-            print(f"❌ Critic: {evaluation}")
-            print("   Sending back to Writer for revision...")
+            say(f"❌ Critic: {evaluation}")
+            say("   Sending back to Writer for revision...")
             return {"critic_approved": False}
     except Exception as e:
-        print(f"⚠️  Critic error: {str(e)}. Approving by default.")
-        return {"critic_approved": True}
+        say(f"⚠️  Critic error: {str(e)}. Approving by default.")
+        return {"critic_approved": True, "critic_error": True}
 
 def route_critic_decision(state: JokeState) -> str:
     """Route based on critic's decision"""
@@ -145,7 +157,7 @@ def route_critic_decision(state: JokeState) -> str:
     if state.critic_approved:
         return "show_final_joke"
     elif state.revision_count >= max_attempts:
-        print(f"\n⚠️  Maximum attempts ({max_attempts}) reached. Using current joke anyway.")
+        say(f"\n⚠️  Maximum attempts ({max_attempts}) reached. Using current joke anyway.")
         return "show_final_joke"
     else:
         return "writer"
@@ -317,6 +329,114 @@ def build_joke_graph() -> CompiledStateGraph:
     
     return workflow.compile()
 
+def build_writer_critic_graph() -> CompiledStateGraph:
+    """Writer-Critic loop on its own, ending once a joke is approved or attempts run out"""
+    workflow = StateGraph(JokeState)
+    workflow.add_node("writer", writer_agent)
+    workflow.add_node("critic", critic_agent)
+    workflow.set_entry_point("writer")
+    workflow.add_edge("writer", "critic")
+    workflow.add_conditional_edges(
+        "critic",
+        route_critic_decision,
+        {
+            "writer": "writer",
+            "show_final_joke": END,
+        }
+    )
+    return workflow.compile()
+
+def append_jokes_to_json(new_jokes: List[Joke]):
+    """Bulk sink: add a batch of jokes to the history with a single write"""
+    if new_jokes:
+        save_jokes_to_json(load_jokes_from_json() + new_jokes)
+
+def run_batch(jobs: List[tuple], max_concurrency: int = 8, batch_size: int = 50) -> dict:
+    """
+    Generate jokes headlessly with the Writer-Critic graph.
+    Args:
+        jobs: (category, language, count) tuples
+        max_concurrency: Max graph runs in flight at once
+        batch_size: Graph runs per batch; approved jokes are saved once per batch
+    Returns:
+        dict: Run statistics
+    """
+    global VERBOSE
+    previous_verbose = VERBOSE
+    VERBOSE = False
+    try:
+        return _run_batch(jobs, max_concurrency, batch_size)
+    finally:
+        # Later interactive use in the same process should be chatty again
+        VERBOSE = previous_verbose
+
+def _run_batch(jobs: List[tuple], max_concurrency: int, batch_size: int) -> dict:
+    graph = build_writer_critic_graph()
+    states = [
+        JokeState(category=category, language=language)
+        for category, language, count in jobs
+        for _ in range(count)
+    ]
+
+    approved = 0
+    critic_errors = 0
+    llm_calls = 0
+    start = time.perf_counter()
+    for offset in range(0, len(states), batch_size):
+        results = graph.batch(
+            states[offset:offset + batch_size],
+            config={"max_concurrency": max_concurrency, "recursion_limit": 20},
+            return_exceptions=True,
+        )
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        new_jokes = []
+        for state, result in zip(states[offset:offset + batch_size], results):
+            if isinstance(result, Exception):
+                print(f"Warning: Joke run failed: {str(result)}")
+                continue
+            llm_calls += 2 * result["revision_count"]  # One writer + one critic call per attempt
+            # Jokes the critic never reviewed (e.g. rate-limited) are not approved
+            if result["critic_error"]:
+                critic_errors += 1
+                continue
+            # get_joke returns an error string on API failures; never store those
+            if result["critic_approved"] and not result["current_joke"].startswith("Error generating joke"):
+                new_jokes.append(Joke(
+                    text=result["current_joke"],
+                    category=state.category,
+                    language=state.language,
+                    timestamp=timestamp
+                ))
+        append_jokes_to_json(new_jokes)
+        approved += len(new_jokes)
+        print(f"Batch {offset // batch_size + 1}: {len(new_jokes)}/{len(results)} approved")
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "runs": len(states),
+        "approved": approved,
+        "critic_errors": critic_errors,
+        "jokes_per_minute": approved / elapsed * 60 if elapsed else 0.0,
+        "approval_rate": approved / len(states) if states else 0.0,
+        "llm_calls_per_approved": llm_calls / approved if approved else 0.0,
+        "seconds": elapsed,
+    }
+    print(f"\n{'='*60}")
+    print(f"Approved {approved}/{len(states)} jokes in {elapsed:.1f}s")
+    print(f"Jokes/minute: {stats['jokes_per_minute']:.1f}")
+    print(f"Approval rate: {stats['approval_rate']:.0%}")
+    print(f"Skipped (critic failed): {critic_errors}")
+    print(f"LLM calls per approved joke: {stats['llm_calls_per_approved']:.2f}")
+    print(f"{'='*60}\n")
+    return stats
+
+def parse_job(spec: str) -> tuple:
+    """Parse a CATEGORY:LANGUAGE:COUNT job spec, e.g. chuck:hi:10"""
+    category, language, count = spec.split(":")
+    if category not in ("neutral", "chuck", "all") or language not in ("en", "hi", "gj"):
+        raise argparse.ArgumentTypeError(f"Invalid job '{spec}'")
+    return category, language, int(count)
+
 def main():
     print("="*60)
     print("🎭 Welcome to the AI-Powered Joke-Telling Bot! 🎭")
@@ -334,4 +454,14 @@ def main():
     final_state = graph.invoke(initial_state, config={"recursion_limit": 100})
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="AI-Powered Joke-Telling Bot")
+    parser.add_argument("--batch", nargs="+", type=parse_job, metavar="CATEGORY:LANGUAGE:COUNT",
+                        help="Run headless, e.g. --batch neutral:en:20 chuck:hi:10")
+    parser.add_argument("--concurrency", type=int, default=8, help="Max concurrent graph runs")
+    parser.add_argument("--batch-size", type=int, default=50, help="Jokes saved per write")
+    args = parser.parse_args()
+
+    if args.batch:
+        run_batch(args.batch, max_concurrency=args.concurrency, batch_size=args.batch_size)
+    else:
+        main()
@@ -0,0 +1,67 @@
+import sys
+import time
+import tempfile
+import numpy as np
+import chromadb
+
+# Compare query latency with and without metadata pre-filters on a large
+# synthetic collection (random vectors, so no embedding model is needed).
+# Usage: python benchmark_filters.py [num_chunks ...]
+
+DIMENSIONS = 384  # all-MiniLM-L6-v2
+CHUNKS_PER_DOCUMENT = 50
+SECTIONS = ["Abstract", "Introduction", "Methods", "Conclusion"]
+BATCH_SIZE = 5000
+QUERIES = 50
+
+
+def build_collection(client, num_chunks):
+    """Fill a collection with random chunks that carry ingestion-style metadata"""
+    collection = client.create_collection(
+        name=f"bench_{num_chunks}",
+        metadata={"hnsw:space": "cosine"}
+    )
+    rng = np.random.default_rng(0)
+    for start in range(0, num_chunks, BATCH_SIZE):
+        end = min(start + BATCH_SIZE, num_chunks)
+        collection.add(
+            ids=[f"document_{i}" for i in range(start, end)],
+            embeddings=rng.standard_normal((end - start, DIMENSIONS)).tolist(),
+            metadatas=[
+                {
+                    "doc_id": f"paper_{i // CHUNKS_PER_DOCUMENT}",
+                    "section": SECTIONS[i % len(SECTIONS)],
+                }
+                for i in range(start, end)
+            ],
+        )
+    return collection
+
+
+def time_queries(collection, query_vectors, where=None, top_k=5):
+    """Average milliseconds per query"""
+    start = time.perf_counter()
+    for vector in query_vectors:
+        collection.query(query_embeddings=[vector], n_results=top_k, where=where)
+    return (time.perf_counter() - start) / len(query_vectors) * 1000
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 50_000, 100_000]
+    query_vectors = np.random.default_rng(1).standard_normal((QUERIES, DIMENSIONS)).tolist()
+
+    with tempfile.TemporaryDirectory() as db_path:
+        client = chromadb.PersistentClient(path=db_path)
+        print(f"{'chunks':>8}  {'no filter':>10}  {'section':>10}  {'1 document':>10}  {'5 documents':>11}")
+        for size in sizes:
+            collection = build_collection(client, size)
+            time_queries(collection, query_vectors[:5])  # warm up the index
+
+            filters = [
+                None,
+                {"section": "Conclusion"},
+                {"doc_id": {"$in": ["paper_0"]}},
+                {"doc_id": {"$in": [f"paper_{i}" for i in range(5)]}},
+            ]
+            timings = [time_queries(collection, query_vectors, where) for where in filters]
+            print(f"{size:>8}  " + "  ".join(f"{ms:>8.1f}ms" for ms in timings))
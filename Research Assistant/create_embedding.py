@@ -1,59 +1,104 @@
-import os
-import torch
+import hashlib
+import argparse
 import chromadb
-from langchain_huggingface import HuggingFaceEmbeddings
-from load_publications import chunk_research_paper
+from embedding_backend import get_embeddings
+from load_publications import chunk_research_paper, chunk_metadata, load_research_documents
 
 def embed_documents(documents: list[str]) -> list[list[float]]:
-    device = (
-        "cuda"
-        if torch.cuda.is_available()
-        else "mps" if torch.backends.mps.is_available() else "cpu"
-    )
-    model = HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2",
-        model_kwargs={"device": device},
-    )
+    # Backend comes from EMBEDDING_BACKEND (torch, onnx or onnx-int8)
+    model = get_embeddings()
 
     embeddings = model.embed_documents(documents)
     return embeddings
 
-def read_documents_from_folder(folder_path: str) -> list[str]:
-    documents = []
-    for filename in os.listdir(folder_path):
-        if filename.endswith(".txt"):
-            with open(os.path.join(folder_path, filename), "r", encoding="utf-8") as f:
-                documents.append(f.read())
-    return documents
+def index_documents(collection, documents):
+    """
+    Replace the chunks of each document with freshly embedded ones.
+    Chunk IDs are the chunk_id from chunk_research_paper, so they are stable
+    across runs and never depend on the collection size.
+    Args:
+        collection (chromadb.Collection): The collection to update
+        documents (list[dict]): Documents from load_research_documents
+    Returns:
+        None
+    """
+    ids, texts, metadatas = [], [], []
+    for document in documents:
+        for chunk in chunk_research_paper(document["content"], document["doc_id"]):
+            ids.append(chunk["chunk_id"])
+            texts.append(chunk["content"])
+            metadatas.append(chunk_metadata(chunk, document))
+
+    # One embedding call for all the documents
+    embeddings = embed_documents(texts) if texts else []
+
+    # Find the chunks each document has now, before writing the new ones
+    old_ids = set()
+    for document in documents:
+        old_ids.update(collection.get(where={"source": document["source"]}, include=[])["ids"])
+
+    # Upsert first so queries never see a document with no chunks, then drop
+    # only the chunks a shorter new version no longer has
+    if ids:
+        collection.upsert(embeddings=embeddings, ids=ids, documents=texts, metadatas=metadatas)
+    stale_ids = old_ids - set(ids)
+    if stale_ids:
+        collection.delete(ids=list(stale_ids))
+
+def legacy_chunk_ids(collection):
+    """
+    IDs of chunks written before source metadata existed (document_N IDs with
+    only title/chunk_id). Filters on source/doc_id never match them and
+    index_documents cannot replace them, so they must be purged and re-ingested.
+    """
+    results = collection.get(include=["metadatas"])
+    return [
+        chunk_id
+        for chunk_id, metadata in zip(results["ids"], results["metadatas"])
+        if not metadata or ("source" not in metadata and "start_char" not in metadata)
+    ]
+
+def purge_legacy_chunks(collection):
+    """Delete old-format chunks; returns how many were removed"""
+    ids = legacy_chunk_ids(collection)
+    if ids:
+        collection.delete(ids=ids)
+    return len(ids)
 
 def insert_publications(collection, publications):
     """
     Insert documents into a ChromaDB collection.
     Args:
         collection (chromadb.Collection): The collection to insert documents into
-        publications (list[str]): The documents to insert
+        publications (list[str] | list[dict]): The documents to insert, either plain
+            text or dicts from load_research_documents (adds source metadata)
     Returns:
         None
     """
-    next_id = collection.count()
-    for idx, publication in enumerate(publications):
-        # Use the filename or index as title for chunking
-        title = f"Publication_{next_id+idx}"
+    for publication in publications:
+        if isinstance(publication, dict):
+            index_documents(collection, [publication])
+            continue
+
+        # Unknown source: title by content hash so IDs stay stable and unique
+        title = f"Publication_{hashlib.md5(publication.encode('utf-8')).hexdigest()[:12]}"
         chunks = chunk_research_paper(publication, title)
         chunk_texts = [chunk['content'] for chunk in chunks]
         embeddings = embed_documents(chunk_texts)
-        ids = [f"document_{next_id + i}" for i in range(len(chunk_texts))]
-        collection.add(
+        collection.upsert(
             embeddings=embeddings,
-            ids=ids,
+            ids=[chunk['chunk_id'] for chunk in chunks],
             documents=chunk_texts,
-            metadatas=[{'title': chunk['title'], 'chunk_id': chunk['chunk_id']} for chunk in chunks]
+            metadatas=[chunk_metadata(chunk) for chunk in chunks]
         )
-        next_id += len(chunk_texts)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embed research_documents into the research_papers collection")
+    parser.add_argument("--migrate", action="store_true",
+                        help="Only re-ingest if the database still has old-format chunks")
+    args = parser.parse_args()
+
     folder = "research_documents"
-    documents = read_documents_from_folder(folder)
     
     # Initialize ChromaDB client and collection
     client = chromadb.PersistentClient(path="./research_db")
@@ -62,8 +107,17 @@ if __name__ == "__main__":
         metadata={"hnsw:space": "cosine"}
     )
     
+    # Old-format chunks would sit next to the re-ingested copies as duplicates
+    purged = purge_legacy_chunks(collection)
+    if purged:
+        print(f"Removed {purged} old-format chunks without source metadata; re-ingesting {folder}.")
+    elif args.migrate:
+        print("Database is up to date, no migration needed.")
+        raise SystemExit(0)
+    
     # Insert publications into the collection
+    documents = load_research_documents(folder)
     insert_publications(collection, documents)
     
     print(f"Successfully inserted {len(documents)} publications into the collection.")
-    print(f"Total chunks in collection: {collection.count()}")
\ No newline at end of file
+    print(f"Total chunks in collection: {collection.count()}")
@@ -1,6 +1,6 @@
 import chromadb
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_huggingface import HuggingFaceEmbeddings
+from embedding_backend import get_embeddings
 
 # Initialize ChromaDB
 client = chromadb.PersistentClient(path="./research_db")
@@ -9,8 +9,6 @@ collection = client.get_or_create_collection(
     metadata={"hnsw:space": "cosine"}
 )
 
-# Set up our embedding model
-embeddings = HuggingFaceEmbeddings(
-    model_name="sentence-transformers/all-MiniLM-L6-v2"
-)
+# Set up our embedding model (EMBEDDING_BACKEND selects torch, onnx or onnx-int8)
+embeddings = get_embeddings()
 
@@ -0,0 +1,177 @@
+import os
+import time
+from functools import lru_cache
+import numpy as np
+from dotenv import load_dotenv
+from langchain_core.embeddings import Embeddings
+
+# Every script that embeds text imports this module, so settings in .env apply everywhere
+load_dotenv()
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+ONNX_DIR = "./onnx_models"
+MAX_SEQ_LENGTH = 256  # Same truncation as the sentence-transformers model
+BATCH_SIZE = 32
+
+# Backend is picked with EMBEDDING_BACKEND: "torch" (default), "onnx" or "onnx-int8".
+# EMBEDDING_THREADS sets intra-op threads (default: CPUs this process may use).
+BACKENDS = ["torch", "onnx", "onnx-int8"]
+
+
+def default_threads():
+    """CPUs available to this process (respects affinity/cpusets in containers)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def export_onnx(model_name=MODEL_NAME, output_dir=ONNX_DIR, quantize=False):
+    """
+    Export the locally cached transformer to ONNX, optionally int8-quantized.
+    Args:
+        model_name (str): Hugging Face model to export
+        output_dir (str): Folder for the .onnx files
+        quantize (bool): Also write a dynamically int8-quantized copy
+    Returns:
+        str: Path of the model to load (quantized one if requested)
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    fp32_path = os.path.join(output_dir, "model.onnx")
+    int8_path = os.path.join(output_dir, "model_int8.onnx")
+
+    if not os.path.exists(fp32_path):
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModel.from_pretrained(model_name, torchscript=True).eval()
+        sample = tokenizer(["export sample"], return_tensors="pt")
+        input_names = ["input_ids", "attention_mask", "token_type_ids"]
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                tuple(sample[name] for name in input_names),
+                fp32_path,
+                input_names=input_names,
+                output_names=["last_hidden_state", "pooler_output"],
+                dynamic_axes={
+                    **{name: {0: "batch", 1: "sequence"} for name in input_names},
+                    "last_hidden_state": {0: "batch", 1: "sequence"},
+                    "pooler_output": {0: "batch"},
+                },
+                opset_version=14,
+            )
+        tokenizer.save_pretrained(output_dir)
+
+    if not quantize:
+        return fp32_path
+
+    if not os.path.exists(int8_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+
+class OnnxEmbeddings(Embeddings):
+    """Drop-in replacement for HuggingFaceEmbeddings running MiniLM on onnxruntime"""
+
+    def __init__(self, model_name=MODEL_NAME, onnx_dir=ONNX_DIR, quantize=False, num_threads=None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_path = export_onnx(model_name, onnx_dir, quantize=quantize)
+        self.tokenizer = AutoTokenizer.from_pretrained(onnx_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = num_threads or default_threads()
+        options.inter_op_num_threads = 1  # Single request at a time, parallelism is within ops
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+    def _embed(self, texts):
+        vectors = []
+        for start in range(0, len(texts), BATCH_SIZE):
+            batch = self.tokenizer(
+                texts[start:start + BATCH_SIZE],
+                padding=True,
+                truncation=True,
+                max_length=MAX_SEQ_LENGTH,
+                return_tensors="np",
+            )
+            feed = {name: batch[name].astype(np.int64) for name in self.input_names}
+            hidden = self.session.run(["last_hidden_state"], feed)[0]
+
+            # Mean pooling over real tokens, then L2 normalize (as sentence-transformers does)
+            mask = batch["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            vectors.append(pooled)
+        return np.concatenate(vectors).tolist() if vectors else []
+
+    def embed_documents(self, texts):
+        return self._embed(list(texts))
+
+    def embed_query(self, text):
+        return self._embed([text])[0]
+
+
+def get_device():
+    """Best available torch device"""
+    import torch
+    return (
+        "cuda"
+        if torch.cuda.is_available()
+        else "mps" if torch.backends.mps.is_available() else "cpu"
+    )
+
+
+def get_embeddings(backend=None, num_threads=None):
+    """Return the embedding model for a backend (loaded once per process)"""
+    backend = backend or os.getenv("EMBEDDING_BACKEND", "torch")
+    num_threads = num_threads or int(os.getenv("EMBEDDING_THREADS", "0")) or default_threads()
+    return _load_embeddings(backend, num_threads)
+
+
+@lru_cache(maxsize=None)
+def _load_embeddings(backend, num_threads):
+    if backend == "torch":
+        import torch
+        from langchain_huggingface import HuggingFaceEmbeddings
+        torch.set_num_threads(num_threads)
+        return HuggingFaceEmbeddings(
+            model_name=MODEL_NAME,
+            model_kwargs={"device": get_device()},
+        )
+    if backend in ("onnx", "onnx-int8"):
+        return OnnxEmbeddings(quantize=backend == "onnx-int8", num_threads=num_threads)
+    raise ValueError(f"Unknown embedding backend '{backend}', choose from {BACKENDS}")
+
+
+if __name__ == "__main__":
+    from load_publications import chunk_research_paper, load_research_documents
+
+    texts = [
+        chunk["content"]
+        for document in load_research_documents("research_documents")
+        for chunk in chunk_research_paper(document["content"], document["doc_id"])
+    ]
+    texts = (texts * (256 // max(len(texts), 1) + 1))[:256]
+
+    reference = np.asarray(get_embeddings("torch").embed_documents(texts))
+    for backend in BACKENDS:
+        model = get_embeddings(backend)
+        model.embed_documents(texts[:8])  # warm up
+
+        start = time.perf_counter()
+        vectors = np.asarray(model.embed_documents(texts))
+        elapsed = time.perf_counter() - start
+
+        # Parity: cosine similarity of each vector against the torch output
+        cosine = (vectors * reference).sum(axis=1) / (
+            np.linalg.norm(vectors, axis=1) * np.linalg.norm(reference, axis=1)
+        )
+        print(
+            f"{backend:<10} {len(texts) / elapsed:8.1f} texts/s  "
+            f"cosine vs torch: min {cosine.min():.4f} mean {cosine.mean():.4f}"
+        )
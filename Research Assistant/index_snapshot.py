@@ -0,0 +1,168 @@
+import os
+import json
+import hashlib
+import argparse
+from datetime import datetime
+import numpy as np
+import chromadb
+from embedding_backend import MODEL_NAME
+
+# A snapshot is a folder with:
+#   embeddings.npy  float32 matrix, one row per chunk (memory-mapped on import)
+#   rows.jsonl      one {"id", "document", "metadata"} line per chunk, same order
+#   manifest.json   embedding model, collection settings, row count, dimensions
+#                   and sha256 of each file
+SNAPSHOT_FORMAT = 2
+PAGE_SIZE = 5000
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def export_snapshot(collection, snapshot_dir, model=MODEL_NAME):
+    """
+    Write a collection's IDs, embeddings, documents and metadata to a snapshot folder.
+    Args:
+        collection (chromadb.Collection): The collection to export
+        snapshot_dir (str): Folder to write the snapshot into
+        model (str): Embedding model that produced the collection's vectors
+    Returns:
+        dict: The snapshot manifest
+    """
+    total = collection.count()
+    os.makedirs(snapshot_dir, exist_ok=True)
+    embeddings_path = os.path.join(snapshot_dir, "embeddings.npy")
+    rows_path = os.path.join(snapshot_dir, "rows.jsonl")
+
+    # Stream page by page: text goes out as variable-length JSON lines and
+    # vectors into a preallocated .npy, so memory stays at one page
+    vectors = None
+    dimensions = 0
+    with open(rows_path, "w", encoding="utf-8") as rows:
+        for offset in range(0, total, PAGE_SIZE):
+            page = collection.get(
+                limit=PAGE_SIZE,
+                offset=offset,
+                include=["embeddings", "documents", "metadatas"]
+            )
+            page_vectors = np.asarray(page["embeddings"], dtype=np.float32)
+            if vectors is None:
+                dimensions = page_vectors.shape[1]
+                vectors = np.lib.format.open_memmap(
+                    embeddings_path, mode="w+", dtype=np.float32, shape=(total, dimensions)
+                )
+            vectors[offset:offset + len(page_vectors)] = page_vectors
+            for chunk_id, document, metadata in zip(page["ids"], page["documents"], page["metadatas"]):
+                rows.write(json.dumps(
+                    {"id": chunk_id, "document": document or "", "metadata": metadata},
+                    ensure_ascii=False
+                ) + "\n")
+    if vectors is None:
+        np.save(embeddings_path, np.zeros((0, 0), dtype=np.float32))
+    else:
+        vectors.flush()
+        del vectors
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "created_at": datetime.now().isoformat(),
+        "model": model,
+        "backend": os.getenv("EMBEDDING_BACKEND", "torch"),  # Informational: backends share the model
+        "collection": collection.name,
+        "collection_metadata": collection.metadata,
+        "count": total,
+        "dimensions": int(dimensions),
+        "files": {
+            "embeddings.npy": _sha256(embeddings_path),
+            "rows.jsonl": _sha256(rows_path),
+        },
+    }
+    with open(os.path.join(snapshot_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def import_snapshot(client, snapshot_dir, name=None, replace=False, model=MODEL_NAME):
+    """
+    Bulk-load a snapshot into a collection without running the embedding model.
+    Args:
+        client (chromadb.ClientAPI): Client for the target database
+        snapshot_dir (str): Folder written by export_snapshot
+        model (str): Embedding model queries will use; must match the snapshot
+        name (str): Collection name (defaults to the exported one)
+        replace (bool): Drop an existing collection of the same name first
+    Returns:
+        chromadb.Collection: The loaded collection
+    """
+    with open(os.path.join(snapshot_dir, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest["format"] != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format: {manifest['format']}")
+    for filename, checksum in manifest["files"].items():
+        if _sha256(os.path.join(snapshot_dir, filename)) != checksum:
+            raise ValueError(f"Checksum mismatch for {filename}, snapshot is corrupt")
+
+    # Vectors from another model would load fine and silently give wrong results
+    if manifest.get("model") != model:
+        raise ValueError(f"Snapshot was embedded with '{manifest.get('model')}', expected '{model}'")
+    embeddings = np.load(os.path.join(snapshot_dir, "embeddings.npy"), mmap_mode="r")
+    expected_shape = (manifest["count"], manifest["dimensions"]) if manifest["count"] else (0, 0)
+    if embeddings.shape != expected_shape:
+        raise ValueError(f"Embeddings have shape {embeddings.shape}, manifest says {expected_shape}")
+    with open(os.path.join(snapshot_dir, "rows.jsonl"), "r", encoding="utf-8") as rows:
+        row_count = sum(1 for _ in rows)
+    if row_count != manifest["count"]:
+        raise ValueError(f"Snapshot has {row_count} rows, manifest says {manifest['count']}")
+
+    name = name or manifest["collection"]
+    if replace:
+        try:
+            client.delete_collection(name=name)
+        except Exception:
+            pass  # Nothing to replace
+    collection = client.get_or_create_collection(
+        name=name,
+        metadata=manifest["collection_metadata"] or {"hnsw:space": "cosine"}
+    )
+    if collection.count() > 0:
+        raise ValueError(f"Collection '{name}' is not empty, use replace=True to overwrite it")
+
+    with open(os.path.join(snapshot_dir, "rows.jsonl"), "r", encoding="utf-8") as rows:
+        offset = 0
+        while True:
+            page = [json.loads(line) for _, line in zip(range(PAGE_SIZE), rows)]
+            if not page:
+                break
+            collection.add(
+                ids=[row["id"] for row in page],
+                embeddings=embeddings[offset:offset + len(page)].tolist(),
+                documents=[row["document"] for row in page],
+                metadatas=[row["metadata"] for row in page],
+            )
+            offset += len(page)
+    return collection
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export or import a research collection snapshot")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("--db", default="./research_db", help="ChromaDB folder")
+    parser.add_argument("--collection", default=None,
+                        help="Collection name (export default: research_papers; import default: the exported name)")
+    parser.add_argument("--snapshot", default="./research_snapshot", help="Snapshot folder")
+    parser.add_argument("--replace", action="store_true", help="Overwrite an existing collection on import")
+    args = parser.parse_args()
+
+    client = chromadb.PersistentClient(path=args.db)
+    if args.command == "export":
+        collection = client.get_collection(name=args.collection or "research_papers")
+        manifest = export_snapshot(collection, args.snapshot)
+        print(f"Exported {manifest['count']} chunks from '{collection.name}' to {args.snapshot}")
+    else:
+        collection = import_snapshot(client, args.snapshot, name=args.collection, replace=args.replace)
+        print(f"Imported {collection.count()} chunks into '{collection.name}' from {args.snapshot}")
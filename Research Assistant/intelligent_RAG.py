@@ -1,27 +1,22 @@
 
 import os
-import torch
 import chromadb
 from langchain_groq import ChatGroq
 from langchain.prompts import PromptTemplate
-from langchain_huggingface import HuggingFaceEmbeddings
+from embedding_backend import get_embeddings
 from dotenv import load_dotenv
 import json
+import argparse
 from datetime import datetime
+from retrieval import build_where_filter, format_chunk
+from sharded_search import open_shards, search_sharded_db
+from model_router import MODEL_TIERS, RoutingStats, route_and_invoke
 
 # Load environment variables
 load_dotenv()
 
-# Initialize embeddings model
-device = (
-    "cuda"
-    if torch.cuda.is_available()
-    else "mps" if torch.backends.mps.is_available() else "cpu"
-)
-embeddings = HuggingFaceEmbeddings(
-    model_name="sentence-transformers/all-MiniLM-L6-v2",
-    model_kwargs={"device": device},
-)
+# Initialize embeddings model (EMBEDDING_BACKEND selects torch, onnx or onnx-int8)
+embeddings = get_embeddings()
 
 # Initialize ChromaDB
 client = chromadb.PersistentClient(path="./research_db")
@@ -30,35 +25,44 @@ collection = client.get_or_create_collection(
     metadata={"hnsw:space": "cosine"}
 )
 
-def search_research_db(query, collection, embeddings, top_k=5):
-    """Find the most relevant research chunks for a query"""
+def search_research_db(query, collection, embeddings, top_k=5, where=None, doc_ids=None):
+    """
+    Find the most relevant research chunks for a query.
+    Args:
+        where (dict): Chroma metadata filter, e.g. {"section": "Conclusion"}
+        doc_ids (list[str]): Only search chunks from these documents
+    """
     
     # Convert question to vector
     query_vector = embeddings.embed_query(query)
     
-    # Search for similar content
+    # Search for similar content; Chroma applies the filter before ranking
     results = collection.query(
         query_embeddings=[query_vector],
         n_results=top_k,
+        where=build_where_filter(where, doc_ids),
         include=["documents", "metadatas", "distances"]
     )
     
     # Format results
     relevant_chunks = []
     for i, doc in enumerate(results["documents"][0]):
-        relevant_chunks.append({
-            "content": doc,
-            "title": results["metadatas"][0][i]["title"],
-            "similarity": 1 - results["distances"][0][i]  # Convert distance to similarity
-        })
+        relevant_chunks.append(format_chunk(doc, results["metadatas"][0][i], results["distances"][0][i]))
     
     return relevant_chunks
 
-def answer_research_question(query, collection, embeddings, llm):
-    """Generate an answer based on retrieved research"""
+def answer_research_question(query, collection, embeddings, llm, where=None, doc_ids=None, routing_stats=None):
+    """
+    Generate an answer based on retrieved research.
+    Args:
+        collection: A single collection, or a list of shards from open_shards
+        llm: A single chat model, or a dict of models keyed by tier ("small", "large")
+            to route each question to the cheapest suitable model
+    """
     
     # Get relevant research chunks
-    relevant_chunks = search_research_db(query, collection, embeddings, top_k=3)
+    search = search_sharded_db if isinstance(collection, list) else search_research_db
+    relevant_chunks = search(query, collection, embeddings, top_k=3, where=where, doc_ids=doc_ids)
     
     # Build context from research
     context = "\n\n".join([
@@ -85,7 +89,10 @@ def answer_research_question(query, collection, embeddings, llm):
     
     # Generate answer
     prompt = prompt_template.format(context=context, question=query)
-    response = llm.invoke(prompt)
+    if isinstance(llm, dict):
+        response, model_tier = route_and_invoke(prompt, relevant_chunks, context, llm, routing_stats)
+    else:
+        response, model_tier = llm.invoke(prompt), None
 
     # Store Q&A in JSON
         
@@ -93,9 +100,12 @@ def answer_research_question(query, collection, embeddings, llm):
         "timestamp": datetime.now().isoformat(),
         "question": query,
         "answer": response.content,
+        "model_tier": model_tier,
         "sources": [
             {
                 "title": chunk['title'],
+                "source": chunk['source'],
+                "section": chunk['section'],
                 "content": chunk['content']
             }
             for chunk in relevant_chunks
@@ -118,8 +128,26 @@ def answer_research_question(query, collection, embeddings, llm):
     return response.content, relevant_chunks
 
 if __name__ == "__main__":
-    # Initialize LLM
-    llm = ChatGroq(model="qwen/qwen3-32b")
+    parser = argparse.ArgumentParser(description="Intelligent Research Assistant")
+    parser.add_argument("--watch", action="store_true",
+                        help="Index new or changed files in research_documents while running")
+    parser.add_argument("--shards", nargs="+", metavar="DB_PATH:COLLECTION",
+                        help="Search these shards in parallel instead of the single research_papers collection")
+    args = parser.parse_args()
+
+    if args.shards:
+        if args.watch:
+            parser.error("--watch indexes the single collection and cannot be combined with --shards")
+        collection = open_shards([tuple(spec.rsplit(":", 1)) for spec in args.shards])
+
+    if args.watch:
+        # Same collection handle as the queries, so new chunks are searchable immediately
+        from watch_documents import start_watcher
+        start_watcher(collection, "research_documents")
+
+    # Initialize LLMs; simple lookups go to the small model
+    llm = {tier: ChatGroq(model=model) for tier, model in MODEL_TIERS.items()}
+    routing_stats = RoutingStats()
     
     # Example query
     query = "What are effective techniques for handling class imbalance?"
@@ -130,7 +158,8 @@ if __name__ == "__main__":
         query,
         collection, 
         embeddings, 
-        llm
+        llm,
+        routing_stats=routing_stats
     )
     
     print("=" * 80)
@@ -152,6 +181,7 @@ if __name__ == "__main__":
     while True:
         user_query = input("Your question: ").strip()
         if user_query.lower() in ['quit', 'exit', 'q']:
+            print(f"Routing summary: {json.dumps(routing_stats.summary())}")
             print("Goodbye!")
             break
         
@@ -163,7 +193,8 @@ if __name__ == "__main__":
             user_query,
             collection, 
             embeddings, 
-            llm
+            llm,
+            routing_stats=routing_stats
         )
         
         print("=" * 80)
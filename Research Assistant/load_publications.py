@@ -1,4 +1,5 @@
 import os
+import re
 from langchain_community.document_loaders import TextLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
@@ -29,28 +30,83 @@ def load_research_publications(documents_path):
     
     return publications
 
+CHUNK_SIZE = 1000  # ~200 words per chunk
+
+# Lines such as "Abstract:" or "Introduction:" start a new section
+SECTION_HEADING = re.compile(r"^([^\n:]{1,80}):[ \t]*$", re.MULTILINE)
+
+def load_research_document(documents_path, file):
+    """Load one .txt file with the source details kept for chunk metadata"""
+    file_path = os.path.join(documents_path, file)
+    modified_at = os.path.getmtime(file_path)
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+    return {
+        "content": content,
+        "source": file,
+        "doc_id": os.path.splitext(file)[0],
+        "modified_at": modified_at,
+    }
+
+def load_research_documents(documents_path):
+    """Load all .txt files with the source details kept for chunk metadata"""
+    return [
+        load_research_document(documents_path, file)
+        for file in sorted(os.listdir(documents_path))
+        if file.endswith(".txt")
+    ]
+
+def find_section(paper_content, position):
+    """Return the heading of the section that contains a character position"""
+    section = ""
+    for match in SECTION_HEADING.finditer(paper_content):
+        if match.start() > position:
+            break
+        section = match.group(1).strip()
+    return section
+
 def chunk_research_paper(paper_content, title):
     """Break a research paper into searchable chunks"""
     
     text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,          # ~200 words per chunk
+        chunk_size=CHUNK_SIZE,
         chunk_overlap=200,        # Overlap to preserve context
-        separators=["\n\n", "\n", ". ", " ", ""]
+        separators=["\n\n", "\n", ". ", " ", ""],
+        add_start_index=True,     # Keep each chunk's offset in the paper
     )
     
-    chunks = text_splitter.split_text(paper_content)
+    chunks = text_splitter.create_documents([paper_content])
     
     # Add metadata to each chunk
     chunk_data = []
     for i, chunk in enumerate(chunks):
+        start = chunk.metadata["start_index"]
         chunk_data.append({
-            "content": chunk,
+            "content": chunk.page_content,
             "title": title,
             "chunk_id": f"{title}_{i}",
+            "section": find_section(paper_content, start),
+            "start_char": start,
+            "end_char": start + len(chunk.page_content),
         })
     
     return chunk_data
 
+def chunk_metadata(chunk, document=None):
+    """Build the Chroma metadata for a chunk, adding source details when known"""
+    metadata = {
+        "title": chunk["title"],
+        "chunk_id": chunk["chunk_id"],
+        "section": chunk["section"],
+        "start_char": chunk["start_char"],
+        "end_char": chunk["end_char"],
+    }
+    if document is not None:
+        metadata["source"] = document["source"]
+        metadata["doc_id"] = document["doc_id"]
+        metadata["modified_at"] = document["modified_at"]
+    return metadata
+
 if __name__ == "__main__":
     # Path to research documents
     documents_path = "./research_documents"
@@ -73,4 +129,5 @@ if __name__ == "__main__":
         print("\nSample chunk:")
         print(f"Title: {all_chunks[0]['title']}")
         print(f"Chunk ID: {all_chunks[0]['chunk_id']}")
+        print(f"Section: {all_chunks[0]['section']} (chars {all_chunks[0]['start_char']}-{all_chunks[0]['end_char']})")
         print(f"Content preview: {all_chunks[0]['content'][:200]}...")
@@ -0,0 +1,155 @@
+import json
+import time
+from datetime import datetime
+from load_publications import CHUNK_SIZE
+
+# Small model for simple lookups, large model for everything else
+MODEL_TIERS = {
+    "small": "llama-3.1-8b-instant",
+    "large": "qwen/qwen3-32b",
+}
+
+# Must match the fallback sentence in the research prompt
+FALLBACK_ANSWER = "I cannot answer this question based on the available research papers."
+
+STRONG_SIMILARITY = 0.60     # Top chunk must be at least this similar
+SOURCE_THRESHOLD = 0.50      # Chunks above this count as usable sources
+MAX_STRONG_SOURCES = 2       # More usable sources means synthesis -> large model
+# Context the small model gets: about two full chunks (plus their "From <title>:" headers).
+# answer_research_question retrieves up to 3 chunks, so long contexts go to the large model.
+SMALL_CONTEXT_CHUNKS = 2
+MAX_SMALL_CONTEXT = SMALL_CONTEXT_CHUNKS * (CHUNK_SIZE + 100)
+
+ROUTING_LOG = "routing_log.jsonl"
+
+
+def choose_tier(relevant_chunks, context):
+    """Pick a model tier from retrieval signals, without calling any model"""
+    if not relevant_chunks:
+        return "large"
+    top_similarity = max(chunk["similarity"] for chunk in relevant_chunks)
+    strong_sources = sum(1 for chunk in relevant_chunks if chunk["similarity"] >= SOURCE_THRESHOLD)
+
+    if (
+        top_similarity >= STRONG_SIMILARITY
+        and strong_sources <= MAX_STRONG_SOURCES
+        and len(context) <= MAX_SMALL_CONTEXT
+    ):
+        return "small"
+    return "large"
+
+
+def is_fallback_answer(answer):
+    """True when the model said it could not answer from the context"""
+    return FALLBACK_ANSWER.lower().rstrip(".") in answer.lower()
+
+
+class RoutingStats:
+    """Per-tier latency and escalation counts, appended to a JSON lines log"""
+
+    def __init__(self, log_file=ROUTING_LOG):
+        self.log_file = log_file
+        self.calls = {tier: 0 for tier in MODEL_TIERS}
+        self.seconds = {tier: 0.0 for tier in MODEL_TIERS}
+        self.routed = {tier: 0 for tier in MODEL_TIERS}
+        self.escalations = 0
+
+    def record_call(self, tier, seconds):
+        self.calls[tier] += 1
+        self.seconds[tier] += seconds
+
+    def record_question(self, entry):
+        self.routed[entry["initial_tier"]] += 1
+        if entry["escalated"]:
+            self.escalations += 1
+        if self.log_file:
+            with open(self.log_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def summary(self):
+        questions = sum(self.routed.values())
+        return {
+            "questions": questions,
+            "routed": dict(self.routed),
+            "avg_latency_ms": {
+                tier: (self.seconds[tier] / self.calls[tier] * 1000) if self.calls[tier] else 0.0
+                for tier in MODEL_TIERS
+            },
+            "escalation_rate": self.escalations / self.routed["small"] if self.routed["small"] else 0.0,
+        }
+
+
+def route_and_invoke(prompt, relevant_chunks, context, llms, stats=None):
+    """
+    Answer with the cheapest suitable model, escalating on the fallback answer.
+    Args:
+        prompt (str): The fully formatted research prompt
+        relevant_chunks (list[dict]): Retrieved chunks with a "similarity" score
+        context (str): The context text inside the prompt
+        llms (dict[str, BaseChatModel]): Models keyed by tier ("small", "large")
+        stats (RoutingStats): Optional collector for latency and escalations
+    Returns:
+        tuple: (response, tier that produced it)
+    """
+    initial_tier = choose_tier(relevant_chunks, context)
+    tier = initial_tier
+    latencies = {}
+
+    while True:
+        start = time.perf_counter()
+        response = llms[tier].invoke(prompt)
+        latencies[tier] = time.perf_counter() - start
+        if stats:
+            stats.record_call(tier, latencies[tier])
+        if tier == "small" and is_fallback_answer(response.content):
+            tier = "large"
+            continue
+        break
+
+    if stats:
+        stats.record_question({
+            "timestamp": datetime.now().isoformat(),
+            "initial_tier": initial_tier,
+            "final_tier": tier,
+            "escalated": tier != initial_tier,
+            "top_similarity": max((c["similarity"] for c in relevant_chunks), default=0.0),
+            "context_chars": len(context),
+            "latency_ms": {t: s * 1000 for t, s in latencies.items()},
+        })
+    return response, tier
+
+
+if __name__ == "__main__":
+    # Offline check with fake models: no API calls, deterministic latencies
+    from types import SimpleNamespace
+
+    class FakeModel:
+        def __init__(self, delay, answer):
+            self.delay = delay
+            self.answer = answer
+
+        def invoke(self, prompt):
+            time.sleep(self.delay)
+            answer = self.answer(prompt) if callable(self.answer) else self.answer
+            return SimpleNamespace(content=answer)
+
+    llms = {
+        # The small model gives up on questions marked "hard"
+        "small": FakeModel(0.01, lambda p: FALLBACK_ANSWER if "hard" in p else "Short answer."),
+        "large": FakeModel(0.05, "Detailed answer."),
+    }
+    cases = [
+        # (question, chunk similarities, characters per chunk)
+        ("easy lookup", [0.82, 0.41, 0.30], 500),
+        ("hard lookup", [0.75, 0.45, 0.20], 500),
+        ("broad synthesis", [0.66, 0.62, 0.58], 500),
+        ("weak match", [0.35, 0.30, 0.28], 500),
+        ("long context", [0.82, 0.41, 0.30], CHUNK_SIZE),
+    ]
+    stats = RoutingStats(log_file=None)
+    for question, scores, chunk_chars in cases:
+        chunks = [{"similarity": s, "content": "x" * chunk_chars} for s in scores]
+        context = "\n\n".join(c["content"] for c in chunks)
+        response, tier = route_and_invoke(question, chunks, context, llms, stats)
+        print(f"{question:<16} -> {tier:<5} {response.content}")
+    print(json.dumps(stats.summary(), indent=2))
@@ -0,0 +1,24 @@
+def build_where_filter(where=None, doc_ids=None):
+    """Combine a metadata filter with document scoping into one Chroma where clause"""
+    clauses = []
+    if where:
+        clauses.append(where)
+    if doc_ids:
+        clauses.append({"doc_id": {"$in": list(doc_ids)}})
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+def format_chunk(doc, metadata, distance):
+    """Shape one query hit the way every search function returns it"""
+    # Collections filled outside this pipeline may have chunks without metadata
+    metadata = metadata or {}
+    return {
+        "content": doc,
+        "title": metadata.get("title", "Untitled"),
+        "source": metadata.get("source", ""),
+        "section": metadata.get("section", ""),
+        "similarity": 1 - distance  # Convert distance to similarity
+    }
@@ -26,6 +26,22 @@ pip install -r requirements.txt
 cd "Research Assistant"
 
 # Check if research_db exists and has data
+if [ ! -d "research_db" ] || [ ! -f "research_db/chroma.sqlite3" ]; then
+    # Prefer a prebuilt snapshot: bulk-loads vectors without running the embedding model
+    if [ -f "research_snapshot/manifest.json" ]; then
+        echo ""
+        echo "=========================================="
+        echo "Step 1: Loading database from snapshot..."
+        echo "=========================================="
+        python index_snapshot.py import --snapshot research_snapshot --replace
+        
+        if [ $? -ne 0 ]; then
+            echo "Warning: Snapshot import failed, falling back to embedding creation"
+            rm -rf research_db
+        fi
+    fi
+fi
+
 if [ ! -d "research_db" ] || [ ! -f "research_db/chroma.sqlite3" ]; then
     echo ""
     echo "=========================================="
@@ -37,10 +53,19 @@ if [ ! -d "research_db" ] || [ ! -f "research_db/chroma.sqlite3" ]; then
         echo "Error: Failed to create embeddings"
         exit 1
     fi
+    echo "Tip: run 'python index_snapshot.py export' to create a snapshot for faster setup elsewhere."
 else
     echo ""
     echo "Database already exists. Skipping embedding creation."
     echo "To recreate, delete the 'research_db' folder first."
+    
+    # Databases built before source metadata existed need their chunks re-ingested
+    python create_embedding.py --migrate
+    
+    if [ $? -ne 0 ]; then
+        echo "Error: Failed to migrate the existing database"
+        exit 1
+    fi
 fi
 
 # Run the intelligent RAG system
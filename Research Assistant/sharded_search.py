@@ -0,0 +1,166 @@
+import os
+import time
+import hashlib
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import chromadb
+from retrieval import build_where_filter, format_chunk
+from create_embedding import index_documents
+from load_publications import load_research_documents
+
+# Each shard is a (db_path, collection_name) pair. Shards can live in separate
+# collections of one database, in separate database folders, or both.
+DEFAULT_SHARDS = [
+    ("./research_db", "research_papers"),
+    ("./research_db", "ml_publications"),
+]
+
+# Shared pool so every query reuses the same worker threads; grown to one
+# thread per shard so adding shards never makes queries wait for a worker
+_shard_pool = None
+_shard_pool_size = 0
+_shard_pool_lock = threading.Lock()
+_clients = {}
+
+
+def _get_shard_pool(num_shards):
+    """Return the query pool, growing it to at least one thread per shard"""
+    global _shard_pool, _shard_pool_size
+    with _shard_pool_lock:
+        if num_shards > _shard_pool_size:
+            old_pool = _shard_pool
+            _shard_pool = ThreadPoolExecutor(max_workers=num_shards, thread_name_prefix="shard")
+            _shard_pool_size = num_shards
+            if old_pool is not None:
+                old_pool.shutdown(wait=False)  # In-flight queries still finish
+        return _shard_pool
+
+
+def _get_client(db_path):
+    """Reuse one PersistentClient per database folder"""
+    if db_path not in _clients:
+        _clients[db_path] = chromadb.PersistentClient(path=db_path)
+    return _clients[db_path]
+
+
+def route_to_shard(source, num_shards):
+    """Pick a shard index for a source file (stable across runs)"""
+    digest = hashlib.md5(source.encode("utf-8")).hexdigest()
+    return int(digest, 16) % num_shards
+
+
+def open_shards(shard_specs=DEFAULT_SHARDS, create=False):
+    """
+    Open the collections behind each shard.
+    Args:
+        shard_specs (list[tuple[str, str]]): (db_path, collection_name) pairs
+        create (bool): Create missing collections instead of skipping them
+    Returns:
+        list[chromadb.Collection | None]: One entry per shard, None if the shard is missing
+    """
+    shards = []
+    for db_path, name in shard_specs:
+        try:
+            if create:
+                client = _get_client(db_path)
+                collection = client.get_or_create_collection(
+                    name=name,
+                    metadata={"hnsw:space": "cosine"}
+                )
+            else:
+                if not os.path.isdir(db_path):
+                    raise FileNotFoundError(db_path)
+                collection = _get_client(db_path).get_collection(name=name)
+            shards.append(collection)
+        except Exception as e:
+            print(f"Warning: Shard {db_path}:{name} unavailable: {str(e)}")
+            shards.append(None)
+    return shards
+
+
+def insert_into_shards(shards, publications):
+    """
+    Insert documents into the shard chosen by their source name.
+    Args:
+        shards (list[chromadb.Collection]): Shards opened with create=True
+        publications (list[dict]): Documents from load_research_documents
+    Returns:
+        None
+    """
+    for document in publications:
+        source = document["source"]
+        collection = shards[route_to_shard(source, len(shards))]
+        if collection is None:
+            print(f"Warning: Skipping {source}, its shard is unavailable")
+            continue
+        index_documents(collection, [document])
+
+
+def _query_shard(collection, query_vector, top_k, where):
+    results = collection.query(
+        query_embeddings=[query_vector],
+        n_results=top_k,
+        where=where,
+        include=["documents", "metadatas", "distances"]
+    )
+    # Format here so a bad hit only fails its own shard, not the merged search
+    return [
+        (results["distances"][0][i], format_chunk(doc, results["metadatas"][0][i], results["distances"][0][i]))
+        for i, doc in enumerate(results["documents"][0])
+    ]
+
+
+def search_sharded_db(query, shards, embeddings, top_k=5, where=None, doc_ids=None):
+    """
+    Find the most relevant research chunks across all shards.
+    Same arguments and result shape as search_research_db, with a list of shards
+    in place of the collection.
+    """
+
+    # Embed once and send the same vector and filter to every shard
+    query_vector = embeddings.embed_query(query)
+    where = build_where_filter(where, doc_ids)
+
+    live_shards = [collection for collection in shards if collection is not None]
+    pool = _get_shard_pool(len(live_shards))
+    futures = [
+        pool.submit(_query_shard, collection, query_vector, top_k, where)
+        for collection in live_shards
+    ]
+
+    hits = []
+    for future in futures:
+        try:
+            hits.extend(future.result())
+        except Exception as e:
+            # A failing shard only loses its own results
+            print(f"Warning: Shard query failed: {str(e)}")
+
+    # Merge: smallest distance first
+    best = heapq.nsmallest(top_k, hits, key=lambda hit: hit[0])
+    return [chunk for _, chunk in best]
+
+
+if __name__ == "__main__":
+    from embedding_backend import get_embeddings
+
+    publications = load_research_documents("research_documents")
+
+    shard_specs = [(f"./research_shards/shard_{i}", "research_papers") for i in range(4)]
+    shards = open_shards(shard_specs, create=True)
+    insert_into_shards(shards, publications)
+    for spec, collection in zip(shard_specs, shards):
+        print(f"{spec[0]}: {collection.count()} chunks")
+
+    embeddings = get_embeddings()
+    query = "What are the ethical risks of autonomous agents?"
+    embeddings.embed_query(query)  # warm up the model
+
+    # Latency as the number of shards grows
+    for n in range(1, len(shards) + 1):
+        start = time.perf_counter()
+        for _ in range(20):
+            results = search_sharded_db(query, shards[:n], embeddings, top_k=5)
+        elapsed = (time.perf_counter() - start) / 20
+        print(f"{n} shard(s): {elapsed * 1000:.1f} ms/query, top hit {results[0]['title'] if results else '-'}")
@@ -0,0 +1,169 @@
+import os
+import time
+import argparse
+import threading
+import chromadb
+from create_embedding import index_documents, legacy_chunk_ids
+from load_publications import load_research_document
+
+# Polling keeps idle cost to one directory scan per interval and needs no extra
+# dependencies; bursts of saves are debounced into one micro-batched ingest.
+POLL_INTERVAL = 1.0   # Seconds between folder scans
+DEBOUNCE = 2.0        # Wait this long after the last change before ingesting
+BATCH_SIZE = 8        # Files embedded together per micro-batch
+
+
+def scan_folder(folder):
+    """Map each .txt file in the folder to its modification time"""
+    files = {}
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".txt"):
+                continue
+            try:
+                if entry.is_file():
+                    files[entry.name] = entry.stat().st_mtime
+            except FileNotFoundError:
+                pass  # Deleted between listing and stat
+    return files
+
+
+def indexed_sources(collection):
+    """Map each source file already in the collection to the mtime it was ingested at"""
+    indexed = {}
+    for metadata in collection.get(include=["metadatas"])["metadatas"]:
+        if metadata and "source" in metadata:
+            indexed[metadata["source"]] = metadata.get("modified_at")
+    return indexed
+
+
+def ingest_files(collection, folder, filenames):
+    """
+    Replace the chunks of the given files with freshly embedded ones.
+    Args:
+        collection (chromadb.Collection): The collection to update
+        folder (str): Documents folder
+        filenames (list[str]): Files to (re)ingest as one micro-batch
+    Returns:
+        dict[str, float]: Ingested file -> the mtime that was indexed
+    """
+    documents = []
+    for file in filenames:
+        try:
+            documents.append(load_research_document(folder, file))
+        except (FileNotFoundError, UnicodeDecodeError) as e:
+            print(f"Warning: Skipping {file}: {str(e)}")
+
+    index_documents(collection, documents)
+    return {document["source"]: document["modified_at"] for document in documents}
+
+
+def migrate_legacy_chunks(collection, folder, batch_size=BATCH_SIZE):
+    """
+    Replace old-format chunks (no source metadata) with freshly indexed ones.
+    Without this the first poll would see every file as new and index it next
+    to its old copy. The new chunks are written before the old ones are removed,
+    so queries keep finding every document while this runs.
+    """
+    old_ids = legacy_chunk_ids(collection)
+    if not old_ids:
+        return
+    print(f"Migrating {len(old_ids)} old-format chunks: re-indexing {folder}...")
+    files = sorted(scan_folder(folder))
+    for start in range(0, len(files), batch_size):
+        ingest_files(collection, folder, files[start:start + batch_size])
+    collection.delete(ids=old_ids)
+    print("Migration complete.")
+
+
+def watch_folder(collection, folder, interval=POLL_INTERVAL, debounce=DEBOUNCE,
+                 batch_size=BATCH_SIZE, stop_event=None):
+    """Poll the folder and ingest new, modified or removed files until stopped"""
+    stop_event = stop_event or threading.Event()
+    known = None
+    pending = {}
+    last_change = 0.0
+
+    while not stop_event.is_set():
+        # Any failure only skips this poll; the watcher thread must keep running
+        try:
+            if known is None:
+                migrate_legacy_chunks(collection, folder, batch_size)
+                known = indexed_sources(collection)
+
+            current = scan_folder(folder)
+
+            changed = {
+                file: mtime for file, mtime in current.items()
+                if known.get(file) != mtime and pending.get(file) != mtime
+            }
+            if changed:
+                pending.update(changed)
+                last_change = time.monotonic()
+
+            for file in [file for file in known if file not in current]:
+                collection.delete(where={"source": file})
+                del known[file]
+                print(f"Removed {file} from the index")
+
+            if pending and time.monotonic() - last_change >= debounce:
+                files = sorted(pending)
+                batch_pending = dict(pending)
+                pending.clear()
+                for start in range(0, len(files), batch_size):
+                    batch = files[start:start + batch_size]
+                    try:
+                        ingested = ingest_files(collection, folder, batch)
+                    except Exception as e:
+                        # Retry the whole batch after the next debounce period
+                        print(f"Warning: Indexing {', '.join(batch)} failed, will retry: {str(e)}")
+                        for file in batch:
+                            pending.setdefault(file, batch_pending[file])
+                        last_change = time.monotonic()
+                        continue
+                    known.update(ingested)
+
+                    # End-to-end latency: file saved -> chunks queryable
+                    now = time.time()
+                    for file, mtime in ingested.items():
+                        print(f"Indexed {file} ({now - mtime:.2f}s after save)")
+        except Exception as e:
+            print(f"Warning: Document watcher poll failed: {str(e)}")
+
+        stop_event.wait(interval)
+
+
+def start_watcher(collection, folder, **kwargs):
+    """Run watch_folder in a daemon thread; returns the event that stops it"""
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=watch_folder,
+        args=(collection, folder),
+        kwargs={**kwargs, "stop_event": stop_event},
+        name="document-watcher",
+        daemon=True,
+    )
+    thread.start()
+    return stop_event
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch research_documents and keep the index up to date")
+    parser.add_argument("--folder", default="research_documents")
+    parser.add_argument("--db", default="./research_db")
+    parser.add_argument("--collection", default="research_papers")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL)
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    client = chromadb.PersistentClient(path=args.db)
+    collection = client.get_or_create_collection(
+        name=args.collection,
+        metadata={"hnsw:space": "cosine"}
+    )
+    print(f"Watching {args.folder} (Ctrl+C to stop)")
+    try:
+        watch_folder(collection, args.folder, args.interval, args.debounce, args.batch_size)
+    except KeyboardInterrupt:
+        print("Stopped watching.")